@@ -0,0 +1,73 @@
+"""
+Shared API key setup for the TradingAgents report scripts.
+
+Replace the placeholder keys below with your actual keys, or leave them as-is and
+export FINNHUB_API_KEY / OPENAI_API_KEY in your environment instead.
+"""
+
+import os
+
+# Set hardcoded API keys (replace with your actual keys)
+FINNHUB_API_KEY = "your_finnhub_api_key_here"  # Get free key from https://finnhub.io/
+OPENAI_API_KEY = "your_openai_api_key_here"    # Get key from https://platform.openai.com/api-keys
+
+_PLACEHOLDER_KEYS = {"your_finnhub_api_key_here", "your_openai_api_key_here"}
+
+# Keys from the first successful ensure_keys() call
+_validated_keys = None
+
+
+def _resolve_key(hardcoded_key, env_var):
+    """Return the hardcoded key if it was replaced, otherwise the environment value."""
+    if hardcoded_key not in _PLACEHOLDER_KEYS:
+        return hardcoded_key
+    env_key = os.getenv(env_var)
+    if env_key and env_key not in _PLACEHOLDER_KEYS:
+        return env_key
+    return None
+
+
+def resolve_keys():
+    """
+    Look up the FinnHub and OpenAI API keys without validating or exporting them.
+    
+    Returns:
+        (finnhub_key, openai_key) tuple; a key is None if it is not configured
+    """
+    return (
+        _resolve_key(FINNHUB_API_KEY, "FINNHUB_API_KEY"),
+        _resolve_key(OPENAI_API_KEY, "OPENAI_API_KEY"),
+    )
+
+
+def ensure_keys():
+    """
+    Validate the FinnHub and OpenAI API keys and export them to the environment.
+    
+    A successful result is cached, so repeated calls (e.g. from both scripts)
+    validate once. A failure is not cached, so keys exported afterwards are
+    picked up by the next call.
+    
+    Returns:
+        (finnhub_key, openai_key) tuple, or None if a key is not configured
+    """
+    global _validated_keys
+    if _validated_keys is not None:
+        return _validated_keys
+    
+    finnhub_key, openai_key = resolve_keys()
+    if finnhub_key is None:
+        print("ERROR: Please replace FINNHUB_API_KEY with your actual FinnHub API key!")
+        print("Get a free key from: https://finnhub.io/")
+        return None
+    
+    if openai_key is None:
+        print("ERROR: Please replace OPENAI_API_KEY with your actual OpenAI API key!")
+        print("Get a key from: https://platform.openai.com/api-keys")
+        return None
+    
+    os.environ["FINNHUB_API_KEY"] = finnhub_key
+    os.environ["OPENAI_API_KEY"] = openai_key
+    
+    _validated_keys = (finnhub_key, openai_key)
+    return _validated_keys
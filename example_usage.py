@@ -5,67 +5,79 @@ Example usage of the TradingAgents PDF Report Generator
 This script demonstrates how to use the generate_report.py script with proper API key configuration.
 """
 
+import argparse
+import asyncio
+import multiprocessing
 import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
 
-from generate_report import TradingReportGenerator
+from _keys import ensure_keys
 
 
-def setup_api_keys():
-    """
-    Setup API keys for TradingAgents.
-    
-    IMPORTANT: Replace these with your actual API keys before running!
-    """
-    
-    # FinnHub API Key (get free key from https://finnhub.io/)
-    FINNHUB_API_KEY = "your_actual_finnhub_api_key_here"
-    
-    # OpenAI API Key (get from https://platform.openai.com/api-keys)
-    OPENAI_API_KEY = "your_actual_openai_api_key_here"
-    
-    # Validate API keys
-    if FINNHUB_API_KEY == "your_actual_finnhub_api_key_here":
-        print("ERROR: Please replace FINNHUB_API_KEY with your actual FinnHub API key!")
-        print("Get a free key from: https://finnhub.io/")
-        return False
-    
-    if OPENAI_API_KEY == "your_actual_openai_api_key_here":
-        print("ERROR: Please replace OPENAI_API_KEY with your actual OpenAI API key!")
-        print("Get a key from: https://platform.openai.com/api-keys")
-        return False
-    
-    # Set environment variables
-    os.environ["FINNHUB_API_KEY"] = FINNHUB_API_KEY
-    os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
-    
-    print("✓ API keys configured successfully!")
-    return True
+# Ticker symbols such as AAPL, BRK.B or RDS-A
+_SYMBOL_RE = re.compile(r"[A-Z][A-Z0-9.\-]{0,9}")
+
+def _stock_symbol(value):
+    """argparse type for a ticker symbol; rejects anything that isn't shaped like one."""
+    symbol = value.upper()
+    if not _SYMBOL_RE.fullmatch(symbol):
+        raise argparse.ArgumentTypeError(f"invalid stock symbol: {value!r}")
+    return symbol
+
+def parse_args(argv=None):
+    """Parse the command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Generate TradingAgents PDF reports. Several symbols are analyzed concurrently."
+    )
+    parser.add_argument(
+        "symbols",
+        nargs="*",
+        type=_stock_symbol,
+        metavar="SYMBOL",
+        help="stock symbols to analyze (default: the symbol selected in main())"
+    )
+    return parser.parse_args(argv)
 
 def main():
     """Main function to demonstrate report generation."""
+    args = parse_args()
     
     print("TradingAgents PDF Report Generator - Example Usage")
     print("=" * 60)
     
-    # Setup API keys
-    if not setup_api_keys():
+    # Setup API keys (edit them in _keys.py)
+    if not ensure_keys():
         sys.exit(1)
+    print("✓ API keys configured successfully!")
     
     # Import the report generator after setting up API keys
     try:
-        from generate_report import TradingReportGenerator
+        from generate_report import TradingReportGenerator, _require_reportlab
     except ImportError as e:
         print(f"Error importing generate_report: {e}")
         print("Make sure generate_report.py is in the same directory.")
         sys.exit(1)
+    _require_reportlab()
     
     # Configuration options
     stock_symbols = ["AAPL", "NVDA", "TSLA", "MSFT", "GOOGL"]
     selected_stock = "NVDA"  # Change this to analyze different stocks
     analysis_date = "2025-07-05"  # Change this to analyze different dates
     
+    # Symbols passed on the command line override the selection; several are analyzed concurrently
+    cli_symbols = args.symbols
+    if len(cli_symbols) > 1:
+        print(f"Analyzing {', '.join(cli_symbols)} on {analysis_date} concurrently...")
+        results = asyncio.run(generate_multiple_reports(cli_symbols, analysis_date))
+        if any(isinstance(result, Exception) for result in results):
+            sys.exit(1)
+        return
+    if cli_symbols:
+        selected_stock = cli_symbols[0]
+    
     print(f"Selected Stock: {selected_stock}")
     print(f"Analysis Date: {analysis_date}")
     print(f"Available stocks: {', '.join(stock_symbols)}")
@@ -117,29 +129,151 @@ def main():
         print("4. Make sure the analysis date is not too far in the future")
         sys.exit(1)
 
-def generate_multiple_reports():
+# Tasks holding a concurrency slot for a timed-out analysis that is still running
+_pending_releases = set()
+
+async def _release_when_done(semaphore, thread):
+    """Release a concurrency slot once a timed-out analysis thread has finished."""
+    while thread.is_alive():
+        await asyncio.sleep(1)
+    semaphore.release()
+
+async def _analyze_shared(trading_agents, semaphore, stock, analysis_date):
+    """
+    Run one analysis in a worker thread on the shared TradingAgents graph.
+    
+    A timed-out analysis keeps running in the background, so its slot is only
+    released once it actually finishes. Otherwise stalled tickers could pile up
+    more concurrent pipelines than ``max_concurrency`` allows. The LLM request
+    timeouts (llm_timeout, llm_max_retries) bound how long that can take.
+    """
+    from generate_report import TradingReportGenerator
+    
+    await semaphore.acquire()
+    generator = TradingReportGenerator.from_graph(trading_agents, stock, analysis_date)
+    try:
+        return await generator.run_analysis_async()
+    finally:
+        if generator.abandoned_attempt is None:
+            semaphore.release()
+        else:
+            task = asyncio.create_task(
+                _release_when_done(semaphore, generator.abandoned_attempt)
+            )
+            _pending_releases.add(task)
+            task.add_done_callback(_pending_releases.discard)
+
+async def generate_multiple_reports(stocks=None, analysis_date=None, max_concurrency=4):
     """
-    Example function to generate reports for multiple stocks.
-    Uncomment and modify as needed.
+    Example function to generate reports for multiple stocks concurrently.
+    
+    Each analysis runs in a worker thread, so the network-bound agent calls for
+    different stocks overlap. A single TradingAgents graph is built once and
+    shared by all stocks; at most ``max_concurrency`` analyses run at once to
+    stay within FinnHub/OpenAI rate limits. Finished analyses are rendered to
+    PDF in a process pool, since reportlab layout is CPU-bound and would
+    otherwise serialize on the GIL. The pool uses the "spawn" start method:
+    forking while the analysis threads hold locks can deadlock the workers.
+    
+    Args:
+        stocks: Stock symbols to analyze (default: AAPL, NVDA, TSLA)
+        analysis_date: Date for analysis (default: today)
+        max_concurrency: Maximum number of analyses running at once
     """
-    stocks = ["AAPL", "NVDA", "TSLA"]
-    analysis_date = date.today().strftime("%Y-%m-%d")
-    
-    for stock in stocks:
-        print(f"\nGenerating report for {stock}...")
-        try:
-            generator = TradingReportGenerator(
-                stock_symbol=stock,
-                analysis_date=analysis_date
+    if not ensure_keys():
+        sys.exit(1)
+    
+    from generate_report import TradingReportGenerator, _render_pdf, _require_reportlab
+    
+    # Fail before the (slow) analyses rather than when rendering the PDFs
+    _require_reportlab()
+    
+    stocks = stocks or ["AAPL", "NVDA", "TSLA"]
+    analysis_date = analysis_date or date.today().strftime("%Y-%m-%d")
+    
+    trading_agents = TradingReportGenerator.build_shared()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    loop = asyncio.get_running_loop()
+    
+    with ProcessPoolExecutor(
+        max_workers=min(os.cpu_count() or 1, len(stocks)),
+        mp_context=multiprocessing.get_context("spawn")
+    ) as render_pool:
+        async def _one(stock):
+            print(f"\nGenerating report for {stock}...")
+            final_state, decision = await _analyze_shared(
+                trading_agents, semaphore, stock, analysis_date
+            )
+            return await loop.run_in_executor(
+                render_pool, _render_pdf, final_state, decision, stock, analysis_date
             )
-            final_state, decision = generator.run_analysis()
-            output_file = generator.generate_pdf_report(final_state, decision)
-            print(f"✓ Report generated for {stock}: {output_file}")
-        except Exception as e:
-            print(f"✗ Failed to generate report for {stock}: {e}")
+        
+        results = await asyncio.gather(
+            *(_one(stock) for stock in stocks),
+            return_exceptions=True
+        )
+    
+    for stock, result in zip(stocks, results):
+        if isinstance(result, Exception):
+            print(f"✗ Failed to generate report for {stock}: {result}")
+        else:
+            print(f"✓ Report generated for {stock}: {result}")
+    
+    return results
+
+async def generate_date_sweep_report(stock="NVDA", analysis_dates=None, max_concurrency=4):
+    """
+    Example function to analyze one stock across several dates into a single PDF.
+    
+    The analyses run concurrently like generate_multiple_reports, then all dates
+    are written to one multi-page document (one section per date) instead of a
+    separate PDF per date. Dates whose analysis failed are left out.
+    
+    Args:
+        stock: Stock symbol to analyze
+        analysis_dates: Dates to analyze, in report order
+        max_concurrency: Maximum number of analyses running at once
+    """
+    if not ensure_keys():
+        sys.exit(1)
+    
+    from generate_report import TradingReportGenerator, generate_combined_pdf, _require_reportlab
+    
+    _require_reportlab()
+    
+    analysis_dates = analysis_dates or ["2025-07-01", "2025-07-02", "2025-07-03"]
+    
+    trading_agents = TradingReportGenerator.build_shared()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    analyses = await asyncio.gather(
+        *(
+            _analyze_shared(trading_agents, semaphore, stock, analysis_date)
+            for analysis_date in analysis_dates
+        ),
+        return_exceptions=True
+    )
+    
+    results = []
+    for analysis_date, analysis in zip(analysis_dates, analyses):
+        if isinstance(analysis, Exception):
+            print(f"✗ Analysis failed for {stock} on {analysis_date}: {analysis}")
+            continue
+        final_state, decision = analysis
+        results.append((final_state, decision, analysis_date))
+    
+    if not results:
+        print(f"✗ No analyses succeeded for {stock}")
+        return None
+    
+    output_file = await asyncio.to_thread(generate_combined_pdf, results, stock)
+    print(f"✓ Combined report generated for {stock}: {output_file}")
+    return output_file
 
 if __name__ == "__main__":
     main()
     
     # Uncomment the line below to generate reports for multiple stocks
-    # generate_multiple_reports()
+    # asyncio.run(generate_multiple_reports())
+    
+    # Uncomment the line below to generate one combined report across several dates
+    # asyncio.run(generate_date_sweep_report())
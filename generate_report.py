@@ -3,161 +3,571 @@
 TradingAgents PDF Report Generator
 
 This script generates a comprehensive PDF trading report using the TradingAgents framework
-with hardcoded API keys and stock symbol for demonstration purposes.
+with hardcoded API keys (see _keys.py) and stock symbol for demonstration purposes.
 """
 
+import asyncio
+import io
 import os
 import sys
+import hashlib
+import importlib
+import importlib.util
+import pickle
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing, suppress
+from functools import lru_cache
 from datetime import datetime, date
 from pathlib import Path
 import json
 
-# Set hardcoded API keys (replace with your actual keys)
-FINNHUB_API_KEY = "your_finnhub_api_key_here"  # Get free key from https://finnhub.io/
-OPENAI_API_KEY = "your_openai_api_key_here"    # Get key from https://platform.openai.com/api-keys
+from _keys import ensure_keys
 
-# Validate and set API keys
-if FINNHUB_API_KEY == "your_finnhub_api_key_here":
-    print("ERROR: Please replace FINNHUB_API_KEY with your actual FinnHub API key!")
-    print("Get a free key from: https://finnhub.io/")
-    sys.exit(1)
+# DEFAULT_CONFIG is a plain dict. TradingAgents (LangGraph, LLM clients) and
+# reportlab are imported lazily by the code that uses them, so importing this
+# module stays cheap.
+from tradingagents.default_config import DEFAULT_CONFIG
 
-if OPENAI_API_KEY == "your_openai_api_key_here":
-    print("ERROR: Please replace OPENAI_API_KEY with your actual OpenAI API key!")
-    print("Get a key from: https://platform.openai.com/api-keys")
-    sys.exit(1)
+# Names that used to be imported at module load, resolved on first access
+_LAZY_IMPORTS = {
+    "TradingAgentsGraph": "tradingagents.graph.trading_graph",
+    "letter": "reportlab.lib.pagesizes",
+    "A4": "reportlab.lib.pagesizes",
+    "SimpleDocTemplate": "reportlab.platypus",
+    "Paragraph": "reportlab.platypus",
+    "Spacer": "reportlab.platypus",
+    "Table": "reportlab.platypus",
+    "TableStyle": "reportlab.platypus",
+    "PageBreak": "reportlab.platypus",
+    "getSampleStyleSheet": "reportlab.lib.styles",
+    "ParagraphStyle": "reportlab.lib.styles",
+    "inch": "reportlab.lib.units",
+    "TA_CENTER": "reportlab.lib.enums",
+    "TA_LEFT": "reportlab.lib.enums",
+    "TA_JUSTIFY": "reportlab.lib.enums",
+}
 
-os.environ["FINNHUB_API_KEY"] = FINNHUB_API_KEY
-os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
+# Lazily imported submodules, resolved to the module itself
+_LAZY_SUBMODULES = {
+    "colors": "reportlab.lib.colors",
+}
 
-# Import TradingAgents after setting environment variables
-from tradingagents.graph.trading_graph import TradingAgentsGraph
-from tradingagents.default_config import DEFAULT_CONFIG
 
-# PDF generation imports
-try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+def __getattr__(name):
+    """Resolve lazily imported names for backward compatibility (PEP 562)."""
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(_LAZY_SUBMODULES[name])
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def _require_reportlab():
+    """Exit with an install hint if reportlab is not available."""
+    if importlib.util.find_spec("reportlab") is None:
+        print("Error: reportlab is required for PDF generation.")
+        print("Please install it with: pip install reportlab")
+        sys.exit(1)
+
+# TradingAgents configuration for reports, built once; generators and graphs get a copy
+_REPORT_CONFIG = {
+    **DEFAULT_CONFIG,
+    "llm_provider": "openai",
+    "deep_think_llm": "gpt-4o-mini",  # Use cost-effective model
+    "quick_think_llm": "gpt-4o-mini",
+    "max_debate_rounds": 1,
+    "online_tools": True,
+    # Overall limit (seconds) for one analysis; individual LLM requests are
+    # limited and retried via llm_timeout / llm_max_retries
+    "analysis_timeout": 900,
+}
+
+# Analysis cache (repeat runs for the same symbol/date/config skip the agents)
+ANALYSIS_CACHE_PATH = Path.home() / ".tradingagents_cache.db"
+ANALYSIS_CACHE_VERSION = 1  # Bump when prompts or tools change
+ANALYSIS_CACHE_CONFIG_KEYS = (
+    "llm_provider",
+    "deep_think_llm",
+    "quick_think_llm",
+    "backend_url",
+    "max_debate_rounds",
+    "max_risk_discuss_rounds",
+    "online_tools",
+)
+
+
+@lru_cache(maxsize=1)
+def _report_styles():
+    """
+    Build the report stylesheet: reportlab's sample styles plus custom styles.
+    
+    The stylesheet is shared by every report, so it is built once on first use
+    rather than per generator.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
+    
+    styles = getSampleStyleSheet()
+    
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Title'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        textColor=colors.darkblue
+    ))
+    
+    # Section header style
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=12,
+        spaceBefore=20,
+        textColor=colors.darkblue,
+        borderWidth=1,
+        borderColor=colors.darkblue,
+        borderPadding=5
+    ))
+    
+    # Subsection header style
+    styles.add(ParagraphStyle(
+        name='SubsectionHeader',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=8,
+        spaceBefore=12,
+        textColor=colors.darkgreen
+    ))
+    
+    # Decision style (for final trading decision)
+    styles.add(ParagraphStyle(
+        name='Decision',
+        parent=styles['Normal'],
+        fontSize=14,
+        spaceAfter=12,
+        alignment=TA_CENTER,
+        textColor=colors.red,
+        fontName='Helvetica-Bold'
+    ))
+    
+    return styles
+
+
+@lru_cache(maxsize=1)
+def _summary_table_layout():
+    """Return the (column widths, TableStyle) shared by every summary table."""
     from reportlab.lib import colors
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-except ImportError:
-    print("Error: reportlab is required for PDF generation.")
-    print("Please install it with: pip install reportlab")
-    sys.exit(1)
+    from reportlab.lib.units import inch
+    from reportlab.platypus import TableStyle
+    
+    col_widths = (2*inch, 3*inch)
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    return col_widths, table_style
+
+
+# Text cleaning for reportlab paragraphs
+@lru_cache(maxsize=128)
+def _clean_text(text):
+    """
+    Collapse whitespace and escape special characters for reportlab.
+    
+    Cleaning is pure, so results are memoized: the same judge decision often
+    appears in several sections, and reruns regenerate identical text.
+    
+    A precompiled re.sub plus str.translate variant was benchmarked and
+    rejected: on a ~105 KB section (100 runs) it took ~1.6 s against ~0.13 s
+    for the split/join and chained str.replace used here.
+    """
+    text = _collapse_whitespace(text)
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _collapse_whitespace(text):
+    """
+    Collapse runs of whitespace into single spaces.
+    
+    str.split() runs entirely in C and, for report-sized text, is both faster
+    and lighter on peak memory than a regex substitution.
+    """
+    return ' '.join(text.split())
+
+
+# (final_state key, section header) for the analyst reports, in report order
+_ANALYST_REPORT_SECTIONS = (
+    ("market_report", "Market Analysis Report"),
+    ("sentiment_report", "Sentiment Analysis Report"),
+    ("news_report", "News Analysis Report"),
+    ("fundamentals_report", "Fundamentals Analysis Report"),
+)
+
+
+def _build_pdf(story, output_filename):
+    """
+    Lay out a story into a PDF in memory, then write it to disk atomically.
+    
+    A failed build leaves no partial file behind, and the output is written with
+    a single call instead of many small writes during layout.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=18
+    )
+    doc.build(story)
+    
+    with buffer.getbuffer() as data:
+        _write_file_atomically(output_filename, data)
+
+
+def _write_file_atomically(output_filename, data):
+    """
+    Write bytes to a temporary file and move it into place in one step.
+    
+    The temporary file has a unique name in the output directory, so concurrent
+    builds of the same report don't share it, and it is removed if writing fails.
+    """
+    directory = os.path.dirname(os.path.abspath(output_filename))
+    temp_file = tempfile.NamedTemporaryFile(
+        dir=directory,
+        prefix=f".{os.path.basename(output_filename)}.",
+        suffix=".tmp",
+        delete=False
+    )
+    try:
+        with temp_file:
+            temp_file.write(data)
+        # NamedTemporaryFile creates the file readable by the owner only
+        os.chmod(temp_file.name, 0o644)
+        os.replace(temp_file.name, output_filename)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temp_file.name)
+        raise
+
+
+# Reports with more text than this (in characters) use WeasyPrint when backend="auto"
+WEASYPRINT_THRESHOLD = 50_000
+
+_REPORT_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>
+  @page { size: A4; margin: 72pt 72pt 18pt 72pt; }
+  body { font-family: Helvetica, Arial, sans-serif; font-size: 10pt; line-height: 1.2; }
+  h1 { color: darkblue; font-size: 24pt; text-align: center; margin-bottom: 30pt; }
+  h2 { color: darkblue; font-size: 16pt; border: 1px solid darkblue; padding: 5pt;
+       margin: 20pt 0 12pt 0; }
+  h3 { color: darkgreen; font-size: 14pt; margin: 12pt 0 8pt 0; }
+  table { border-collapse: collapse; width: 5in; }
+  td { border: 1px solid black; padding: 3pt 6pt; background: beige; }
+  tr:first-child td { background: lightblue; color: whitesmoke; font-weight: bold;
+                      font-size: 12pt; padding-bottom: 12pt; }
+  .decision { color: red; font-weight: bold; font-size: 14pt; text-align: center; }
+  .page-break { page-break-before: always; }
+</style>
+</head>
+<body>
+<h1>TradingAgents Analysis Report: {{ stock_symbol }}</h1>
+
+<h2>Executive Summary</h2>
+<table>
+  <tr><td>Stock Symbol</td><td>{{ stock_symbol }}</td></tr>
+  <tr><td>Analysis Date</td><td>{{ analysis_date }}</td></tr>
+  <tr><td>Final Decision</td><td>{{ decision }}</td></tr>
+  <tr><td>Generated On</td><td>{{ generated_on }}</td></tr>
+</table>
+
+<h2>FINAL TRADING DECISION</h2>
+<p class="decision">{{ decision }}</p>
+
+{% for header, text in analyst_sections %}
+<h2>{{ header }}</h2>
+<p>{{ text }}</p>
+{% endfor %}
+
+<div class="page-break"></div>
+{% for header, subheader, text in detail_sections %}
+<h2>{{ header }}</h2>
+{% if subheader and text %}<h3>{{ subheader }}</h3>{% endif %}
+{% if text %}<p>{{ text }}</p>{% endif %}
+{% endfor %}
+</body>
+</html>
+"""
+
+
+@lru_cache(maxsize=1)
+def _report_html_template():
+    """Compile the HTML report template once (jinja2 is imported on first use)."""
+    import jinja2
+    
+    environment = jinja2.Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+    return environment.from_string(_REPORT_HTML_TEMPLATE)
+
+
+def _build_weasyprint_pdf(html, output_filename):
+    """Render prebuilt report HTML to a PDF with WeasyPrint."""
+    from weasyprint import HTML
+    
+    _write_file_atomically(output_filename, HTML(string=html).write_pdf())
 
 
 class TradingReportGenerator:
     """Generates comprehensive PDF trading reports using TradingAgents framework."""
     
-    def __init__(self, stock_symbol="AAPL", analysis_date=None):
+    def __init__(self, stock_symbol="AAPL", analysis_date=None, trading_agents=None):
         """
         Initialize the report generator.
         
         Args:
             stock_symbol: Stock ticker symbol to analyze (default: AAPL)
             analysis_date: Date for analysis (default: today)
+            trading_agents: Prebuilt TradingAgentsGraph to reuse (default: build a new one
+                when the analysis first runs)
         """
         self.stock_symbol = stock_symbol.upper()
         self.analysis_date = analysis_date or date.today().strftime("%Y-%m-%d")
         
-        # Configure TradingAgents
-        self.config = DEFAULT_CONFIG.copy()
-        self.config["llm_provider"] = "openai"
-        self.config["deep_think_llm"] = "gpt-4o-mini"  # Use cost-effective model
-        self.config["quick_think_llm"] = "gpt-4o-mini"
-        self.config["max_debate_rounds"] = 1
-        self.config["online_tools"] = True
-        
-        # Initialize TradingAgents
-        self.trading_agents = TradingAgentsGraph(debug=True, config=self.config)
-        
-        # PDF styling
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Setup custom styles for the PDF report."""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Title'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue
-        ))
-        
-        # Section header style
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading1'],
-            fontSize=16,
-            spaceAfter=12,
-            spaceBefore=20,
-            textColor=colors.darkblue,
-            borderWidth=1,
-            borderColor=colors.darkblue,
-            borderPadding=5
-        ))
-        
-        # Subsection header style
-        self.styles.add(ParagraphStyle(
-            name='SubsectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            spaceAfter=8,
-            spaceBefore=12,
-            textColor=colors.darkgreen
-        ))
-        
-        # Decision style (for final trading decision)
-        self.styles.add(ParagraphStyle(
-            name='Decision',
-            parent=self.styles['Normal'],
-            fontSize=14,
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            textColor=colors.red,
-            fontName='Helvetica-Bold'
-        ))
-    
-    def run_analysis(self):
-        """Run the TradingAgents analysis and return the results."""
+        # TradingAgents graph, reusing a shared one when given (otherwise built on first use).
+        # The report config is copied since callers may adjust it before the graph is built.
+        self._trading_agents = trading_agents
+        self.config = dict(_REPORT_CONFIG) if trading_agents is None else trading_agents.config
+        
+        # Cached final state to hand to the graph once it is built (see _record_state)
+        self._pending_state = None
+        
+        # Thread of an analysis that timed out but is still running, if any
+        self.abandoned_attempt = None
+    
+    @property
+    def trading_agents(self):
+        """TradingAgentsGraph used for the analysis."""
+        if self._trading_agents is None:
+            self._trading_agents = self.build_shared(self.config)
+            if self._pending_state is not None:
+                self._record_state(self._pending_state)
+        return self._trading_agents
+    
+    @property
+    def styles(self):
+        """Stylesheet for the PDF report."""
+        return _report_styles()
+    
+    @classmethod
+    def build_shared(cls, config=None):
+        """
+        Build a TradingAgentsGraph that can be reused across several generators.
+        
+        Constructing the graph (LLM clients, memories, LangGraph compilation) is
+        the expensive part of initialization, so batch runs should build it once
+        and pass it to from_graph() for each ticker. After concurrent analyses,
+        call reflect_and_remember(returns, ticker=...) on the shared graph so it
+        reflects on that ticker's run rather than whichever finished last.
+        
+        Args:
+            config: TradingAgents configuration (default: the report configuration)
+        """
+        from tradingagents.graph.trading_graph import TradingAgentsGraph
+        
+        return TradingAgentsGraph(debug=True, config=config or dict(_REPORT_CONFIG))
+    
+    @classmethod
+    def from_graph(cls, trading_agents, stock_symbol="AAPL", analysis_date=None):
+        """Create a report generator that reuses an existing TradingAgentsGraph."""
+        return cls(
+            stock_symbol=stock_symbol,
+            analysis_date=analysis_date,
+            trading_agents=trading_agents
+        )
+    
+    def _analysis_cache_key(self):
+        """Build a stable fingerprint of the symbol, date and analysis config."""
+        fingerprint = {
+            "version": ANALYSIS_CACHE_VERSION,
+            "stock_symbol": self.stock_symbol,
+            "analysis_date": self.analysis_date,
+        }
+        for key in ANALYSIS_CACHE_CONFIG_KEYS:
+            fingerprint[key] = self.config.get(key)
+        
+        payload = json.dumps(fingerprint, sort_keys=True).encode()
+        return hashlib.blake2b(payload).hexdigest()
+    
+    def _open_analysis_cache(self):
+        """Open the analysis cache database, creating the table if needed."""
+        db = sqlite3.connect(ANALYSIS_CACHE_PATH)
+        db.execute("CREATE TABLE IF NOT EXISTS cache (k TEXT PRIMARY KEY, blob BLOB)")
+        return db
+    
+    def _load_cached_analysis(self, key):
+        """
+        Return the cached (final_state, decision) for a key, or None.
+        
+        The cache is best-effort: an unreadable database or blob counts as a miss.
+        """
+        try:
+            with closing(self._open_analysis_cache()) as db:
+                row = db.execute("SELECT blob FROM cache WHERE k=?", (key,)).fetchone()
+            return pickle.loads(row[0]) if row else None
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            print(f"Warning: could not read analysis cache: {e}")
+            return None
+    
+    def _store_cached_analysis(self, key, result):
+        """
+        Store a (final_state, decision) result in the analysis cache.
+        
+        Failures are reported and ignored so a finished analysis is never lost.
+        """
+        try:
+            blob = pickle.dumps(result)
+            with closing(self._open_analysis_cache()) as db, db:
+                db.execute(
+                    "INSERT OR REPLACE INTO cache (k, blob) VALUES (?, ?)",
+                    (key, blob),
+                )
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"Warning: could not write analysis cache: {e}")
+    
+    def run_analysis(self, force_refresh=False):
+        """
+        Run the TradingAgents analysis and return the results.
+        
+        Args:
+            force_refresh: Ignore any cached result and rerun the agents
+        """
+        cache_key = self._analysis_cache_key()
+        if not force_refresh:
+            cached = self._load_cached_analysis(cache_key)
+            if cached is not None:
+                final_state, decision = cached
+                print(f"Using cached analysis for {self.stock_symbol} on {self.analysis_date}. "
+                      f"Final decision: {decision}")
+                self._record_state(final_state)
+                return final_state, decision
+        
         print(f"Running TradingAgents analysis for {self.stock_symbol} on {self.analysis_date}...")
         
         try:
             # Run the analysis
-            final_state, decision = self.trading_agents.propagate(
-                self.stock_symbol, 
-                self.analysis_date
-            )
-            
-            print(f"Analysis completed. Final decision: {decision}")
-            return final_state, decision
-            
+            final_state, decision = self._propagate_with_timeout()
         except Exception as e:
             print(f"Error during analysis: {str(e)}")
             raise
+        
+        self._store_cached_analysis(cache_key, (final_state, decision))
+        
+        print(f"Analysis completed. Final decision: {decision}")
+        return final_state, decision
+    
+    def _record_state(self, final_state):
+        """
+        Make a cached final state look like the graph's latest run.
+        
+        A cache hit skips propagate, so without this the graph's state for the
+        ticker (and the eval_results log) would still describe an earlier run and
+        reflect_and_remember would reflect on the wrong analysis. If the graph
+        has not been built yet, the state is applied when it is.
+        """
+        if self._trading_agents is None:
+            self._pending_state = final_state
+            return
+        
+        self._pending_state = None
+        self._trading_agents.record_state(self.stock_symbol, self.analysis_date, final_state)
+    
+    def _propagate_with_timeout(self):
+        """
+        Run propagate with an overall timeout.
+        
+        Stalled FinnHub/OpenAI requests are handled by the request-level timeouts
+        and retries configured on the LLM clients (llm_timeout, llm_max_retries);
+        this is the backstop for an analysis that still runs too long. The whole
+        pipeline is not retried, since the timed-out run cannot be cancelled.
+        
+        The analysis runs in a daemon thread so a timed-out run does not block
+        interpreter exit. It keeps running on the graph and is exposed as
+        abandoned_attempt so batch drivers can count it against their
+        concurrency limit. If it finishes, it records its state and log on the
+        graph like any other propagate, becoming the graph's latest run.
+        
+        Raises:
+            TimeoutError: If the analysis does not finish in time
+        """
+        timeout = self.config.get("analysis_timeout", 900)
+        trading_agents = self.trading_agents
+        outcome = {}
+        
+        def target():
+            try:
+                outcome["result"] = trading_agents.propagate(
+                    self.stock_symbol,
+                    self.analysis_date
+                )
+            except BaseException as e:
+                outcome["error"] = e
+        
+        worker = threading.Thread(
+            target=target,
+            name=f"propagate-{self.stock_symbol}",
+            daemon=True
+        )
+        worker.start()
+        worker.join(timeout)
+        
+        if worker.is_alive():
+            self.abandoned_attempt = worker
+            raise TimeoutError(
+                f"Analysis for {self.stock_symbol} timed out after {timeout}s"
+            )
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+    
+    async def run_analysis_async(self, force_refresh=False):
+        """
+        Run the analysis in a worker thread so several analyses can be awaited together.
+        
+        Args:
+            force_refresh: Ignore any cached result and rerun the agents
+        """
+        return await asyncio.to_thread(self.run_analysis, force_refresh)
     
     def _clean_text_for_pdf(self, text):
         """Clean and format text for PDF generation."""
         if not text:
             return "No data available."
         
-        # Remove excessive whitespace and normalize
-        text = ' '.join(text.split())
-        
-        # Escape special characters for reportlab
-        text = text.replace('&', '&amp;')
-        text = text.replace('<', '&lt;')
-        text = text.replace('>', '&gt;')
-        
-        return text
+        return _clean_text(text)
     
     def _create_summary_table(self, final_state, decision):
         """Create a summary table with key information."""
+        from reportlab.platypus import Table
+        
         data = [
             ['Stock Symbol', self.stock_symbol],
             ['Analysis Date', self.analysis_date],
@@ -165,131 +575,208 @@ class TradingReportGenerator:
             ['Generated On', datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
         ]
         
-        table = Table(data, colWidths=[2*inch, 3*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        col_widths, table_style = _summary_table_layout()
+        table = Table(data, colWidths=col_widths)
+        table.setStyle(table_style)
         
         return table
     
-    def generate_pdf_report(self, final_state, decision, output_filename=None):
-        """Generate a comprehensive PDF report from the analysis results."""
-        
-        if output_filename is None:
-            output_filename = f"trading_report_{self.stock_symbol}_{self.analysis_date}.pdf"
-        
-        # Create the PDF document
-        doc = SimpleDocTemplate(
-            output_filename,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=18
-        )
-        
-        # Build the story (content)
-        story = []
-        
-        # Title
-        title = f"TradingAgents Analysis Report: {self.stock_symbol}"
-        story.append(Paragraph(title, self.styles['CustomTitle']))
-        story.append(Spacer(1, 20))
-        
-        # Summary table
-        story.append(Paragraph("Executive Summary", self.styles['SectionHeader']))
-        story.append(self._create_summary_table(final_state, decision))
-        story.append(Spacer(1, 20))
-        
-        # Final Trading Decision (highlighted)
-        story.append(Paragraph("FINAL TRADING DECISION", self.styles['SectionHeader']))
-        decision_text = f"<b>{decision}</b>"
-        story.append(Paragraph(decision_text, self.styles['Decision']))
-        story.append(Spacer(1, 20))
-        
-        # Market Analysis Report
-        if final_state.get("market_report"):
-            story.append(Paragraph("Market Analysis Report", self.styles['SectionHeader']))
-            market_text = self._clean_text_for_pdf(final_state["market_report"])
-            story.append(Paragraph(market_text, self.styles['Normal']))
-            story.append(Spacer(1, 15))
-        
-        # Sentiment Analysis Report
-        if final_state.get("sentiment_report"):
-            story.append(Paragraph("Sentiment Analysis Report", self.styles['SectionHeader']))
-            sentiment_text = self._clean_text_for_pdf(final_state["sentiment_report"])
-            story.append(Paragraph(sentiment_text, self.styles['Normal']))
-            story.append(Spacer(1, 15))
-        
-        # News Analysis Report
-        if final_state.get("news_report"):
-            story.append(Paragraph("News Analysis Report", self.styles['SectionHeader']))
-            news_text = self._clean_text_for_pdf(final_state["news_report"])
-            story.append(Paragraph(news_text, self.styles['Normal']))
-            story.append(Spacer(1, 15))
-        
-        # Fundamentals Analysis Report
-        if final_state.get("fundamentals_report"):
-            story.append(Paragraph("Fundamentals Analysis Report", self.styles['SectionHeader']))
-            fundamentals_text = self._clean_text_for_pdf(final_state["fundamentals_report"])
-            story.append(Paragraph(fundamentals_text, self.styles['Normal']))
-            story.append(Spacer(1, 15))
+    def _detail_sections(self, final_state):
+        """
+        Return the detailed-analysis sections as (header, subheader, text) tuples.
         
-        # Page break before detailed analysis
-        story.append(PageBreak())
+        The debate sections show their header even without a judge decision, in
+        which case text is None.
+        """
+        sections = []
         
         # Investment Debate Summary
         if final_state.get("investment_debate_state"):
-            story.append(Paragraph("Investment Debate Summary", self.styles['SectionHeader']))
-            
             debate_state = final_state["investment_debate_state"]
-            if hasattr(debate_state, 'get'):
-                judge_decision = debate_state.get("judge_decision", "")
-                if judge_decision:
-                    story.append(Paragraph("Judge Decision:", self.styles['SubsectionHeader']))
-                    judge_text = self._clean_text_for_pdf(judge_decision)
-                    story.append(Paragraph(judge_text, self.styles['Normal']))
-                    story.append(Spacer(1, 10))
+            judge_decision = debate_state.get("judge_decision", "") if hasattr(debate_state, 'get') else ""
+            sections.append(("Investment Debate Summary", "Judge Decision:", judge_decision or None))
         
         # Trader Investment Plan
         if final_state.get("trader_investment_plan"):
-            story.append(Paragraph("Trader Investment Plan", self.styles['SectionHeader']))
-            trader_text = self._clean_text_for_pdf(final_state["trader_investment_plan"])
-            story.append(Paragraph(trader_text, self.styles['Normal']))
-            story.append(Spacer(1, 15))
+            sections.append(("Trader Investment Plan", None, final_state["trader_investment_plan"]))
         
         # Risk Assessment
         if final_state.get("risk_debate_state"):
-            story.append(Paragraph("Risk Assessment", self.styles['SectionHeader']))
-            
             risk_state = final_state["risk_debate_state"]
-            if hasattr(risk_state, 'get'):
-                risk_judge_decision = risk_state.get("judge_decision", "")
-                if risk_judge_decision:
-                    story.append(Paragraph("Risk Management Decision:", self.styles['SubsectionHeader']))
-                    risk_text = self._clean_text_for_pdf(risk_judge_decision)
-                    story.append(Paragraph(risk_text, self.styles['Normal']))
-                    story.append(Spacer(1, 10))
+            risk_judge_decision = risk_state.get("judge_decision", "") if hasattr(risk_state, 'get') else ""
+            sections.append(("Risk Assessment", "Risk Management Decision:", risk_judge_decision or None))
         
         # Final Trade Decision Details
         if final_state.get("final_trade_decision"):
-            story.append(Paragraph("Detailed Final Trade Decision", self.styles['SectionHeader']))
-            final_decision_text = self._clean_text_for_pdf(final_state["final_trade_decision"])
-            story.append(Paragraph(final_decision_text, self.styles['Normal']))
+            sections.append(("Detailed Final Trade Decision", None, final_state["final_trade_decision"]))
+        
+        return sections
+    
+    def _build_story(self, final_state, decision):
+        """Build the reportlab story (list of flowables) for a report."""
+        from reportlab.platypus import Paragraph, Spacer, PageBreak
+        
+        # Build the story (content), adding each block's flowables in one extend
+        styles = self.styles
+        header_style = styles['SectionHeader']
+        subheader_style = styles['SubsectionHeader']
+        body_style = styles['Normal']
+        
+        # Title, summary table and final trading decision (highlighted)
+        title = f"TradingAgents Analysis Report: {self.stock_symbol}"
+        story = [
+            Paragraph(title, styles['CustomTitle']),
+            Spacer(1, 20),
+            Paragraph("Executive Summary", header_style),
+            self._create_summary_table(final_state, decision),
+            Spacer(1, 20),
+            Paragraph("FINAL TRADING DECISION", header_style),
+            Paragraph(f"<b>{decision}</b>", styles['Decision']),
+            Spacer(1, 20),
+        ]
+        
+        # Analyst reports (empty sections are skipped)
+        for key, header in _ANALYST_REPORT_SECTIONS:
+            section_text = final_state.get(key)
+            if not section_text:
+                continue
+            story.extend((
+                Paragraph(header, header_style),
+                Paragraph(self._clean_text_for_pdf(section_text), body_style),
+                Spacer(1, 15),
+            ))
+        
+        # Page break before detailed analysis
+        story.append(PageBreak())
+        
+        # Detailed analysis: debates, trader plan and final decision
+        for header, subheader, text in self._detail_sections(final_state):
+            story.append(Paragraph(header, header_style))
+            if text is None:
+                continue
+            if subheader:
+                story.extend((
+                    Paragraph(subheader, subheader_style),
+                    Paragraph(self._clean_text_for_pdf(text), body_style),
+                    Spacer(1, 10),
+                ))
+            else:
+                story.extend((
+                    Paragraph(self._clean_text_for_pdf(text), body_style),
+                    Spacer(1, 15),
+                ))
+        
+        return story
+    
+    def render_html(self, final_state, decision):
+        """Render the report as HTML (used by the WeasyPrint backend)."""
+        return _report_html_template().render(
+            stock_symbol=self.stock_symbol,
+            analysis_date=self.analysis_date,
+            decision=decision,
+            generated_on=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            analyst_sections=[
+                (header, _collapse_whitespace(final_state[key]))
+                for key, header in _ANALYST_REPORT_SECTIONS
+                if final_state.get(key)
+            ],
+            detail_sections=[
+                (header, subheader, _collapse_whitespace(text) if text else None)
+                for header, subheader, text in self._detail_sections(final_state)
+            ],
+        )
+    
+    def _select_backend(self, final_state):
+        """Pick WeasyPrint for long reports when it and jinja2 are installed, reportlab otherwise."""
+        text_length = sum(len(value) for value in final_state.values() if isinstance(value, str))
+        if text_length > WEASYPRINT_THRESHOLD and all(
+            importlib.util.find_spec(module) for module in ("weasyprint", "jinja2")
+        ):
+            return "weasyprint"
+        return "reportlab"
+    
+    def generate_pdf_report(self, final_state, decision, output_filename=None, backend="reportlab"):
+        """
+        Generate a comprehensive PDF report from the analysis results.
+        
+        Args:
+            final_state: Final TradingAgents state returned by run_analysis
+            decision: Processed trading decision
+            output_filename: Output path (default: trading_report_{SYMBOL}_{DATE}.pdf)
+            backend: "reportlab" (default), "weasyprint" (renders an HTML template;
+                requires jinja2 and weasyprint, faster layout for long reports) or
+                "auto" (weasyprint above WEASYPRINT_THRESHOLD characters if installed)
+        """
+        if output_filename is None:
+            output_filename = f"trading_report_{self.stock_symbol}_{self.analysis_date}.pdf"
+        
+        if backend == "auto":
+            backend = self._select_backend(final_state)
+        
+        if backend == "weasyprint":
+            _build_weasyprint_pdf(self.render_html(final_state, decision), output_filename)
+        elif backend == "reportlab":
+            _build_pdf(self._build_story(final_state, decision), output_filename)
+        else:
+            raise ValueError(f"Unsupported PDF backend: {backend}")
         
-        # Build the PDF
-        doc.build(story)
         print(f"PDF report generated: {output_filename}")
         return output_filename
 
 
+def _render_pdf(final_state, decision, stock_symbol, analysis_date, output_filename=None,
+                backend="reportlab"):
+    """
+    Render a PDF report from finished analysis results.
+    
+    Module-level (and therefore picklable) so batch runs can hand the CPU-bound
+    reportlab layout to a process pool. No TradingAgents graph is built.
+    """
+    generator = TradingReportGenerator(
+        stock_symbol=stock_symbol,
+        analysis_date=analysis_date
+    )
+    return generator.generate_pdf_report(final_state, decision, output_filename, backend)
+
+
+def generate_combined_pdf(results, stock_symbol, output_filename=None):
+    """
+    Generate a single multi-page PDF covering several analysis dates for one stock.
+    
+    Each date gets the same sections as a standalone report, separated by page
+    breaks. Building one document instead of one per date pays reportlab's
+    per-document overhead (fonts, metadata, xref table) only once.
+    
+    Args:
+        results: List of (final_state, decision, analysis_date) tuples, in report order
+        stock_symbol: Stock ticker symbol the results belong to
+        output_filename: Output path (default: trading_report_{SYMBOL}_{FIRST}_to_{LAST}.pdf)
+    """
+    from reportlab.platypus import PageBreak
+    
+    if not results:
+        raise ValueError("No analysis results to include in the combined report")
+    
+    stock_symbol = stock_symbol.upper()
+    if output_filename is None:
+        first_date, last_date = results[0][2], results[-1][2]
+        output_filename = f"trading_report_{stock_symbol}_{first_date}_to_{last_date}.pdf"
+    
+    story = []
+    for final_state, decision, analysis_date in results:
+        if story:
+            story.append(PageBreak())
+        generator = TradingReportGenerator(
+            stock_symbol=stock_symbol,
+            analysis_date=analysis_date
+        )
+        story.extend(generator._build_story(final_state, decision))
+    
+    _build_pdf(story, output_filename)
+    print(f"Combined PDF report generated: {output_filename}")
+    return output_filename
+
+
 def main():
     """Main function to run the report generation."""
     
@@ -297,6 +784,12 @@ def main():
     STOCK_SYMBOL = "AAPL"  # Hardcoded stock symbol
     ANALYSIS_DATE = "2024-12-01"  # Hardcoded analysis date
     
+    # Validate and set API keys (edit them in _keys.py)
+    if not ensure_keys():
+        sys.exit(1)
+    
+    _require_reportlab()
+    
     print("TradingAgents PDF Report Generator")
     print("=" * 50)
     print(f"Stock Symbol: {STOCK_SYMBOL}")
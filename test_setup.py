@@ -7,10 +7,31 @@ This script checks if all required dependencies are installed and API keys are c
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-def test_imports():
+class Logger:
+    """Collects output lines so they can be written to stdout in a single call."""
+    
+    def __init__(self):
+        self.lines = []
+    
+    def __call__(self, message=""):
+        self.lines.append(str(message))
+    
+    def extend(self, other):
+        """Append the lines collected by another Logger."""
+        self.lines.extend(other.lines)
+    
+    def flush(self):
+        """Write all collected lines to stdout at once."""
+        if self.lines:
+            sys.stdout.write("\n".join(self.lines) + "\n")
+            sys.stdout.flush()
+        self.lines = []
+
+def test_imports(log=print):
     """Test if all required packages can be imported."""
-    print("Testing package imports...")
+    log("Testing package imports...")
     
     required_packages = [
         ("reportlab", "reportlab.lib.pagesizes"),
@@ -26,101 +47,102 @@ def test_imports():
     for package_name, import_path in required_packages:
         try:
             __import__(import_path)
-            print(f"✓ {package_name}")
+            log(f"✓ {package_name}")
         except ImportError:
-            print(f"✗ {package_name} - MISSING")
+            log(f"✗ {package_name} - MISSING")
             missing_packages.append(package_name)
     
     if missing_packages:
-        print(f"\nMissing packages: {', '.join(missing_packages)}")
-        print("Install with: pip install " + " ".join(missing_packages))
+        log(f"\nMissing packages: {', '.join(missing_packages)}")
+        log("Install with: pip install " + " ".join(missing_packages))
         return False
     
-    print("✓ All required packages are installed!")
+    log("✓ All required packages are installed!")
     return True
 
-def test_tradingagents_import():
+def test_tradingagents_import(log=print):
     """Test if TradingAgents can be imported."""
-    print("\nTesting TradingAgents import...")
+    log("\nTesting TradingAgents import...")
     
     try:
         from tradingagents.graph.trading_graph import TradingAgentsGraph
         from tradingagents.default_config import DEFAULT_CONFIG
-        print("✓ TradingAgents framework imported successfully!")
+        log("✓ TradingAgents framework imported successfully!")
         return True
     except ImportError as e:
-        print(f"✗ Failed to import TradingAgents: {e}")
-        print("Make sure you're in the TradingAgents directory and have installed dependencies.")
+        log(f"✗ Failed to import TradingAgents: {e}")
+        log("Make sure you're in the TradingAgents directory and have installed dependencies.")
         return False
 
-def test_api_keys():
+def test_api_keys(log=print):
     """Test if API keys are configured."""
-    print("\nTesting API key configuration...")
+    log("\nTesting API key configuration...")
     
-    finnhub_key = os.getenv("FINNHUB_API_KEY")
-    openai_key = os.getenv("OPENAI_API_KEY")
+    from _keys import resolve_keys
+    finnhub_key, openai_key = resolve_keys()
     
-    if not finnhub_key or finnhub_key == "your_finnhub_api_key_here":
-        print("✗ FINNHUB_API_KEY not configured")
-        print("  Set with: export FINNHUB_API_KEY=your_actual_key")
-        print("  Or edit the API key in generate_report.py")
+    if not finnhub_key:
+        log("✗ FINNHUB_API_KEY not configured")
+        log("  Set with: export FINNHUB_API_KEY=your_actual_key")
+        log("  Or edit the API key in _keys.py")
         return False
     else:
-        print("✓ FINNHUB_API_KEY configured")
+        log("✓ FINNHUB_API_KEY configured")
     
-    if not openai_key or openai_key == "your_openai_api_key_here":
-        print("✗ OPENAI_API_KEY not configured")
-        print("  Set with: export OPENAI_API_KEY=your_actual_key")
-        print("  Or edit the API key in generate_report.py")
+    if not openai_key:
+        log("✗ OPENAI_API_KEY not configured")
+        log("  Set with: export OPENAI_API_KEY=your_actual_key")
+        log("  Or edit the API key in _keys.py")
         return False
     else:
-        print("✓ OPENAI_API_KEY configured")
+        log("✓ OPENAI_API_KEY configured")
     
     return True
 
-def test_api_connectivity():
+def test_api_connectivity(log=print):
     """Test basic API connectivity."""
-    print("\nTesting API connectivity...")
+    log("\nTesting API connectivity...")
+    
+    from _keys import resolve_keys
+    finnhub_key, openai_key = resolve_keys()
     
     # Test FinnHub API
     try:
-        import requests
-        finnhub_key = os.getenv("FINNHUB_API_KEY")
-        if finnhub_key and finnhub_key != "your_finnhub_api_key_here":
-            response = requests.get(
+        from tradingagents.http_utils import get_http_session
+        if finnhub_key:
+            response = get_http_session().get(
                 f"https://finnhub.io/api/v1/quote?symbol=AAPL&token={finnhub_key}",
                 timeout=10
             )
             if response.status_code == 200:
-                print("✓ FinnHub API connection successful")
+                log("✓ FinnHub API connection successful")
             else:
-                print(f"✗ FinnHub API error: {response.status_code}")
+                log(f"✗ FinnHub API error: {response.status_code}")
                 return False
         else:
-            print("⚠ Skipping FinnHub test - API key not configured")
+            log("⚠ Skipping FinnHub test - API key not configured")
     except Exception as e:
-        print(f"✗ FinnHub API test failed: {e}")
+        log(f"✗ FinnHub API test failed: {e}")
         return False
     
     # Test OpenAI API
     try:
         from langchain_openai import ChatOpenAI
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if openai_key and openai_key != "your_openai_api_key_here":
-            llm = ChatOpenAI(model="gpt-4o-mini", max_tokens=10)
+        if openai_key:
+            llm = ChatOpenAI(model="gpt-4o-mini", max_tokens=10, api_key=openai_key)
             response = llm.invoke("Hello")
-            print("✓ OpenAI API connection successful")
+            log("✓ OpenAI API connection successful")
         else:
-            print("⚠ Skipping OpenAI test - API key not configured")
+            log("⚠ Skipping OpenAI test - API key not configured")
     except Exception as e:
-        print(f"✗ OpenAI API test failed: {e}")
+        log(f"✗ OpenAI API test failed: {e}")
         return False
     
     return True
 
-def test_pdf_generation():
+def test_pdf_generation(log=print):
     """Test PDF generation capability."""
-    print("\nTesting PDF generation...")
+    log("\nTesting PDF generation...")
     
     try:
         from reportlab.lib.pagesizes import letter
@@ -141,21 +163,33 @@ def test_pdf_generation():
         
         # Check if file was created
         if os.path.exists(test_filename):
-            print("✓ PDF generation test successful")
+            log("✓ PDF generation test successful")
             os.remove(test_filename)  # Clean up
             return True
         else:
-            print("✗ PDF file was not created")
+            log("✗ PDF file was not created")
             return False
             
     except Exception as e:
-        print(f"✗ PDF generation test failed: {e}")
+        log(f"✗ PDF generation test failed: {e}")
         return False
 
+def _run_test(test_name, test_func):
+    """Run a single test, returning its collected output and result."""
+    log = Logger()
+    try:
+        result = test_func(log)
+    except Exception as e:
+        log(f"✗ {test_name} failed with exception: {e}")
+        result = False
+    return log, result
+
 def main():
     """Run all tests."""
-    print("TradingAgents Setup Test")
-    print("=" * 50)
+    # Output is collected and written once at the end (or before exiting)
+    log = Logger()
+    log("TradingAgents Setup Test")
+    log("=" * 50)
     
     tests = [
         ("Package Imports", test_imports),
@@ -165,42 +199,50 @@ def main():
         ("PDF Generation", test_pdf_generation),
     ]
     
+    # The checks are independent and mostly wait on network/disk I/O, so run them
+    # concurrently and collect each one's output in order afterwards
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = {
+            test_name: executor.submit(_run_test, test_name, test_func)
+            for test_name, test_func in tests
+        }
+        outputs = [(test_name, future.result()) for test_name, future in futures.items()]
+    
     results = []
     
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"✗ {test_name} failed with exception: {e}")
-            results.append((test_name, False))
+    for test_name, (output, result) in outputs:
+        log.extend(output)
+        results.append((test_name, result))
     
-    print("\n" + "=" * 50)
-    print("TEST SUMMARY")
-    print("=" * 50)
+    log("\n" + "=" * 50)
+    log("TEST SUMMARY")
+    log("=" * 50)
     
     all_passed = True
     for test_name, result in results:
         status = "PASS" if result else "FAIL"
-        print(f"{test_name}: {status}")
+        log(f"{test_name}: {status}")
         if not result:
             all_passed = False
     
-    print("=" * 50)
+    log("=" * 50)
     
     if all_passed:
-        print("✓ All tests passed! You're ready to generate reports.")
-        print("\nNext steps:")
-        print("1. Edit API keys in generate_report.py or example_usage.py")
-        print("2. Run: python generate_report.py")
-        print("   or: python example_usage.py")
+        log("✓ All tests passed! You're ready to generate reports.")
+        log("\nNext steps:")
+        log("1. Edit API keys in _keys.py")
+        log("2. Run: python generate_report.py")
+        log("   or: python example_usage.py")
     else:
-        print("✗ Some tests failed. Please fix the issues above before proceeding.")
-        print("\nCommon solutions:")
-        print("- Install missing packages: pip install -r requirements.txt")
-        print("- Configure API keys in generate_report.py")
-        print("- Check internet connectivity")
+        log("✗ Some tests failed. Please fix the issues above before proceeding.")
+        log("\nCommon solutions:")
+        log("- Install missing packages: pip install -r requirements.txt")
+        log("- Configure API keys in _keys.py")
+        log("- Check internet connectivity")
+        log.flush()
         sys.exit(1)
+    
+    log.flush()
 
 if __name__ == "__main__":
     main()
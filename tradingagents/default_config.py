@@ -13,10 +13,16 @@ DEFAULT_CONFIG = {
     "deep_think_llm": "o4-mini",
     "quick_think_llm": "gpt-4o-mini",
     "backend_url": "https://api.openai.com/v1",
+    # Per-request timeout (seconds) and retries with backoff for LLM API calls
+    "llm_timeout": 120,
+    "llm_max_retries": 3,
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Send independent LLM prompts (e.g. reflections) concurrently via llm.batch;
+    # still one request per prompt
+    "batch_llm": False,
     # Tool settings
     "online_tools": True,
 }
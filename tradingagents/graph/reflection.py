@@ -1,9 +1,20 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from langchain_openai import ChatOpenAI
 
 
+# Where each reflected component's report lives in the final state. The
+# reflect_* methods and reflect_all both read from this table.
+_REFLECTION_COMPONENTS = {
+    "BULL": ("investment_debate_state", "bull_history"),
+    "BEAR": ("investment_debate_state", "bear_history"),
+    "TRADER": ("trader_investment_plan",),
+    "INVEST JUDGE": ("investment_debate_state", "judge_decision"),
+    "RISK JUDGE": ("risk_debate_state", "judge_decision"),
+}
+
+
 class Reflector:
     """Handles reflection on decisions and updating memory."""
 
@@ -55,11 +66,11 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
 
         return f"{curr_market_report}\n\n{curr_sentiment_report}\n\n{curr_news_report}\n\n{curr_fundamentals_report}"
 
-    def _reflect_on_component(
-        self, component_type: str, report: str, situation: str, returns_losses
-    ) -> str:
-        """Generate reflection for a component."""
-        messages = [
+    def _get_reflection_messages(
+        self, report: str, situation: str, returns_losses
+    ) -> List[Tuple[str, str]]:
+        """Build the reflection prompt for a single component."""
+        return [
             ("system", self.reflection_system_prompt),
             (
                 "human",
@@ -67,55 +78,98 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             ),
         ]
 
+    def _reflect_on_component(
+        self, component_type: str, report: str, situation: str, returns_losses
+    ) -> str:
+        """Generate reflection for a component."""
+        messages = self._get_reflection_messages(report, situation, returns_losses)
+
         result = self.quick_thinking_llm.invoke(messages).content
         return result
 
-    def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
-        """Reflect on bull researcher's analysis and update memory."""
+    def _component_report(self, current_state: Dict[str, Any], component_type: str) -> str:
+        """Look up a component's report in the final state."""
+        report = current_state
+        for key in _REFLECTION_COMPONENTS[component_type]:
+            report = report[key]
+        return report
+
+    def _reflect_and_store(
+        self, current_state, returns_losses, component_type: str, memory
+    ):
+        """Reflect on one component and add the result to its memory."""
         situation = self._extract_current_situation(current_state)
-        bull_debate_history = current_state["investment_debate_state"]["bull_history"]
-
         result = self._reflect_on_component(
-            "BULL", bull_debate_history, situation, returns_losses
+            component_type,
+            self._component_report(current_state, component_type),
+            situation,
+            returns_losses,
         )
-        bull_memory.add_situations([(situation, result)])
-
-    def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
-        """Reflect on bear researcher's analysis and update memory."""
+        memory.add_situations([(situation, result)])
+
+    def reflect_all(
+        self,
+        current_state,
+        returns_losses,
+        bull_memory,
+        bear_memory,
+        trader_memory,
+        invest_judge_memory,
+        risk_manager_memory,
+    ):
+        """Reflect on every component concurrently and update memories.
+
+        The five reflections only depend on the final state, so their prompts are
+        sent concurrently via ``llm.batch`` rather than one after another. This is
+        still one request per prompt; it saves wall-clock time, not API calls.
+        """
         situation = self._extract_current_situation(current_state)
-        bear_debate_history = current_state["investment_debate_state"]["bear_history"]
+        memories = dict(
+            zip(
+                _REFLECTION_COMPONENTS,
+                (
+                    bull_memory,
+                    bear_memory,
+                    trader_memory,
+                    invest_judge_memory,
+                    risk_manager_memory,
+                ),
+            )
+        )
 
-        result = self._reflect_on_component(
-            "BEAR", bear_debate_history, situation, returns_losses
+        results = self.quick_thinking_llm.batch(
+            [
+                self._get_reflection_messages(
+                    self._component_report(current_state, component_type),
+                    situation,
+                    returns_losses,
+                )
+                for component_type in memories
+            ]
         )
-        bear_memory.add_situations([(situation, result)])
+        for memory, result in zip(memories.values(), results):
+            memory.add_situations([(situation, result.content)])
+
+    def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
+        """Reflect on bull researcher's analysis and update memory."""
+        self._reflect_and_store(current_state, returns_losses, "BULL", bull_memory)
+
+    def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
+        """Reflect on bear researcher's analysis and update memory."""
+        self._reflect_and_store(current_state, returns_losses, "BEAR", bear_memory)
 
     def reflect_trader(self, current_state, returns_losses, trader_memory):
         """Reflect on trader's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        trader_decision = current_state["trader_investment_plan"]
-
-        result = self._reflect_on_component(
-            "TRADER", trader_decision, situation, returns_losses
-        )
-        trader_memory.add_situations([(situation, result)])
+        self._reflect_and_store(current_state, returns_losses, "TRADER", trader_memory)
 
     def reflect_invest_judge(self, current_state, returns_losses, invest_judge_memory):
         """Reflect on investment judge's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        judge_decision = current_state["investment_debate_state"]["judge_decision"]
-
-        result = self._reflect_on_component(
-            "INVEST JUDGE", judge_decision, situation, returns_losses
+        self._reflect_and_store(
+            current_state, returns_losses, "INVEST JUDGE", invest_judge_memory
         )
-        invest_judge_memory.add_situations([(situation, result)])
 
     def reflect_risk_manager(self, current_state, returns_losses, risk_manager_memory):
         """Reflect on risk manager's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        judge_decision = current_state["risk_debate_state"]["judge_decision"]
-
-        result = self._reflect_on_component(
-            "RISK JUDGE", judge_decision, situation, returns_losses
+        self._reflect_and_store(
+            current_state, returns_losses, "RISK JUDGE", risk_manager_memory
         )
-        risk_manager_memory.add_situations([(situation, result)])
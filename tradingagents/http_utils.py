@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@lru_cache(maxsize=1)
+def get_http_session():
+    """
+    Return a shared requests.Session for FinnHub and other HTTPS APIs.
+
+    The session keeps connections alive between calls (saving a TLS handshake
+    per request) and retries transient failures and rate limiting.
+    """
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        ),
+    )
+    return session